@@ -3,14 +3,60 @@ from __future__ import annotations
 import argparse
 import csv
 import os
-from dataclasses import dataclass
+import re
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import date, timedelta
-from typing import Iterable, List, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
 
+_MICROS = 1_000_000
+_CSV_BUFFER_SIZE = 1024 * 1024
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*([^#\s=][^=\r\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.MULTILINE
+)
+_STREAM_QUEUE_SIZE = 8
+_STREAM_PUT_TIMEOUT_SECONDS = 0.5
+_SHEETS_CHUNK_ROWS = 10_000
+_STREAM_DONE = object()
+_DEFAULT_CONCURRENCY = 8
+# Values _load_env_file set itself, so a reload can tell them apart from
+# variables that came from the real environment.
+_env_file_values: Dict[str, str] = {}
+
+_CAMPAIGNS_QUERY = """
+SELECT
+  campaign.id,
+  campaign.name,
+  campaign.status,
+  metrics.impressions,
+  metrics.clicks,
+  metrics.ctr,
+  metrics.search_impression_share,
+  metrics.average_cpc,
+  metrics.cost_micros,
+  metrics.conversions,
+  metrics.conversions_value,
+  metrics.cost_per_conversion
+FROM campaign
+WHERE {where}
+  AND campaign.status = ENABLED
+  AND campaign.advertising_channel_type = SEARCH
+ORDER BY metrics.cost_micros DESC
+""".strip()
+
+_campaigns_cache: Dict[Tuple[str, int, date], Tuple[float, List[CampaignRow]]] = {}
+_campaigns_cache_lock = threading.Lock()
+
+
 @dataclass
 class CampaignRow:
     campaign_id: int
@@ -27,28 +73,50 @@ class CampaignRow:
     conversion_value: Optional[float]
     cost_per_conversion: Optional[float]
 
+    @property
+    def css_class(self) -> str:
+        # Row class used by the web dashboard tables.
+        return "total-row" if self.campaign_name == "TOTAL" else ""
+
+
+_HEADERS = tuple(field.name for field in fields(CampaignRow))
+_ROW_GETTER = attrgetter(*_HEADERS)
+
 
+@lru_cache(maxsize=32)
 def _normalize_customer_id(value: str) -> str:
     return value.replace("-", "").strip()
 
 
-def _load_env_file(path: Optional[str]) -> None:
+def _load_env_file(path: Optional[str], reload: bool = False) -> None:
+    # The file only fills in variables the environment does not set. With
+    # reload=True, variables it set earlier are updated (or unset when they
+    # have left the file), unless something else has changed them since.
     if not path:
         return
     if not os.path.exists(path):
         raise FileNotFoundError(f"Env file not found: {path}")
 
     with open(path, "r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip("'\"")
-            if not value:
-                continue
-            os.environ.setdefault(key, value)
+        text = handle.read()
+
+    loaded: Dict[str, str] = {}
+    for match in _ENV_LINE_RE.finditer(text):
+        value = match.group(2).strip("'\"")
+        if value:
+            # First occurrence wins, as with the setdefault this replaced.
+            loaded.setdefault(match.group(1), value)
+
+    previous = dict(_env_file_values) if reload else {}
+    for key in previous.keys() - loaded.keys():
+        if os.environ.get(key) == previous[key]:
+            del os.environ[key]
+        del _env_file_values[key]
+    for key, value in loaded.items():
+        current = os.environ.get(key)
+        if current is None or current == previous.get(key):
+            os.environ[key] = value
+            _env_file_values[key] = value
 
 
 def _resolve_env_file(args: argparse.Namespace) -> Optional[str]:
@@ -61,32 +129,18 @@ def _resolve_env_file(args: argparse.Namespace) -> Optional[str]:
     return None
 
 
-def _micros_to_currency(micros: Optional[float]) -> Optional[float]:
-    if micros is None:
-        return None
-    return round(micros / 1_000_000, 2)
-
-
 def _ratio_to_percent(ratio: Optional[float]) -> Optional[float]:
     if ratio is None:
         return None
     return round(float(ratio) * 100, 2)
 
 
-def _ratio_raw(ratio: Optional[float]) -> Optional[float]:
-    if ratio is None:
-        return None
-    return round(float(ratio), 4)
-
-
-def _round_float(value: Optional[float], digits: int = 2) -> Optional[float]:
-    if value is None:
-        return None
-    return round(float(value), digits)
+def _date_range_clause(days: int) -> str:
+    return _date_range_clause_for(days, date.today())
 
 
-def _date_range_clause(days: int) -> str:
-    end = date.today()
+@lru_cache(maxsize=8)
+def _date_range_clause_for(days: int, end: date) -> str:
     start = end - timedelta(days=days - 1)
     return f"segments.date BETWEEN '{start}' AND '{end}'"
 
@@ -95,10 +149,8 @@ def _build_client(args: argparse.Namespace) -> GoogleAdsClient:
     if args.google_ads_yaml:
         return GoogleAdsClient.load_from_storage(args.google_ads_yaml)
 
-    env_file = _resolve_env_file(args)
-    if env_file:
-        _load_env_file(env_file)
-
+    # Credentials come from args or the environment; callers load .env first
+    # (main() at startup, the web app once per process via _load_config).
     developer_token = args.developer_token or os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN")
     client_id = args.client_id or os.getenv("GOOGLE_ADS_CLIENT_ID")
     client_secret = args.client_secret or os.getenv("GOOGLE_ADS_CLIENT_SECRET")
@@ -135,61 +187,209 @@ def _build_client(args: argparse.Namespace) -> GoogleAdsClient:
 def _fetch_campaigns(
     client: GoogleAdsClient, customer_id: str, days: int
 ) -> List[CampaignRow]:
-    query = f"""
-        SELECT
-          campaign.id,
-          campaign.name,
-          campaign.status,
-          metrics.impressions,
-          metrics.clicks,
-          metrics.ctr,
-          metrics.search_impression_share,
-          metrics.average_cpc,
-          metrics.cost_micros,
-          metrics.conversions,
-          metrics.conversions_value,
-          metrics.cost_per_conversion
-        FROM campaign
-        WHERE {_date_range_clause(days)}
-          AND campaign.status = ENABLED
-          AND campaign.advertising_channel_type = SEARCH
-        ORDER BY metrics.cost_micros DESC
-    """.strip()
+    return list(_iter_campaigns(client, customer_id, days))
+
+
+def _fetch_campaigns_cached(
+    client: GoogleAdsClient, customer_id: str, days: int, ttl_seconds: float
+) -> List[CampaignRow]:
+    # Keyed on the calendar day as well, so a cached range never leaks across
+    # midnight. The client is not part of the key: one process uses one set of
+    # credentials.
+    if ttl_seconds <= 0:
+        return _fetch_campaigns(client, customer_id, days)
+
+    key = (_normalize_customer_id(customer_id), days, date.today())
+    now = time.monotonic()
+    with _campaigns_cache_lock:
+        cached = _campaigns_cache.get(key)
+    if cached and now - cached[0] < ttl_seconds:
+        return list(cached[1])
+
+    rows = _fetch_campaigns(client, customer_id, days)
+    with _campaigns_cache_lock:
+        expired = [
+            cache_key
+            for cache_key, (stored_at, _) in _campaigns_cache.items()
+            if now - stored_at >= ttl_seconds
+        ]
+        for cache_key in expired:
+            del _campaigns_cache[cache_key]
+        _campaigns_cache[key] = (now, rows)
+    return list(rows)
+
+
+def _iter_campaigns(
+    client: GoogleAdsClient, customer_id: str, days: int
+) -> Iterator[CampaignRow]:
+    query = _CAMPAIGNS_QUERY.format(where=_date_range_clause(days))
 
     service = client.get_service("GoogleAdsService")
     customer_id = _normalize_customer_id(customer_id)
 
-    rows: List[CampaignRow] = []
     try:
         stream = service.search_stream(customer_id=customer_id, query=query)
-        for batch in stream:
-            for row in batch.results:
-                metrics = row.metrics
-                rows.append(
-                    CampaignRow(
-                        campaign_id=row.campaign.id,
-                        campaign_name=row.campaign.name,
-                        status=row.campaign.status.name,
-                        impressions=int(metrics.impressions or 0),
-                        clicks=int(metrics.clicks or 0),
-                        ctr_percent=_ratio_to_percent(metrics.ctr),
-                        search_impression_share=_ratio_raw(
-                            metrics.search_impression_share
-                        ),
-                        average_cpc=_micros_to_currency(metrics.average_cpc),
-                        cost_per_click=_micros_to_currency(metrics.average_cpc),
-                        cost=_micros_to_currency(metrics.cost_micros),
-                        conversions=_round_float(metrics.conversions, 2) or 0.0,
-                        conversion_value=_round_float(metrics.conversions_value, 2),
-                        cost_per_conversion=_micros_to_currency(
-                            metrics.cost_per_conversion
-                        ),
-                    )
-                )
+        for batch in _prefetch_batches(stream):
+            yield from _rows_from_results(batch.results)
     except GoogleAdsException as ex:
         raise RuntimeError(_format_google_ads_error(ex)) from ex
 
-    return rows
+
+def _parse_concurrency(raw: Optional[str]) -> int:
+    # Unset means the default; anything else must be a whole number, and at
+    # least one worker always runs.
+    if not raw:
+        return _DEFAULT_CONCURRENCY
+    value = raw.strip()
+    if not value.isdecimal():
+        raise ValueError(
+            f"GOOGLE_ADS_CONCURRENCY must be a whole number, got {raw!r}"
+        )
+    return max(int(value), 1)
+
+
+def _iter_campaigns_concurrently(
+    client: GoogleAdsClient,
+    customer_ids: Sequence[str],
+    days: int,
+    max_workers: int = _DEFAULT_CONCURRENCY,
+) -> Iterator[CampaignRow]:
+    # API calls are I/O-bound, so one shared client can serve several customers
+    # at once. Rows are still yielded in the order the IDs were given.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_fetch_campaigns, client, customer_id, days)
+            for customer_id in customer_ids
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def _prefetch_batches(stream: Iterable, maxsize: int = _STREAM_QUEUE_SIZE) -> Iterator:
+    # Drain the gRPC stream on a background thread so converting one batch
+    # overlaps with waiting on the network for the next one.
+    batches: queue.Queue = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        # A consumer that gave up never empties the queue again; re-check
+        # so the producer can exit instead of blocking for good.
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=_STREAM_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for batch in stream:
+                if not put((batch, None)):
+                    return
+        except BaseException as ex:
+            put((None, ex))
+        else:
+            put((_STREAM_DONE, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+    finished = False
+    try:
+        while True:
+            batch, error = batches.get()
+            if error is not None:
+                finished = True
+                raise error
+            if batch is _STREAM_DONE:
+                finished = True
+                return
+            yield batch
+    finally:
+        stopped.set()
+        # Closed early (a conversion error or an abandoned generator): end
+        # the RPC too, so the producer is not left waiting on the network.
+        cancel = getattr(stream, "cancel", None)
+        if not finished and cancel is not None:
+            cancel()
+
+
+def _rows_from_results(results) -> List[CampaignRow]:
+    # Gather raw values column by column first, then convert each column in a
+    # single pass, instead of running every helper per row.
+    ids: List[int] = []
+    names: List[str] = []
+    status_numbers: List[int] = []
+    impressions: List[int] = []
+    clicks: List[int] = []
+    ctr: List[Optional[float]] = []
+    search_impression_share: List[Optional[float]] = []
+    average_cpc_micros: List[Optional[float]] = []
+    cost_micros: List[Optional[float]] = []
+    conversions: List[Optional[float]] = []
+    conversions_value: List[Optional[float]] = []
+    cost_per_conversion_micros: List[Optional[float]] = []
+
+    status_enum = None
+    for row in results:
+        # Read the underlying protobuf message directly; proto-plus wraps every
+        # attribute access in a Python-level marshal step.
+        pb = getattr(row, "_pb", row)
+        campaign = pb.campaign
+        metrics = pb.metrics
+        if status_enum is None:
+            status_enum = campaign.DESCRIPTOR.fields_by_name["status"].enum_type
+        ids.append(campaign.id)
+        names.append(campaign.name)
+        status_numbers.append(campaign.status)
+        impressions.append(metrics.impressions or 0)
+        clicks.append(metrics.clicks or 0)
+        ctr.append(metrics.ctr)
+        search_impression_share.append(metrics.search_impression_share)
+        average_cpc_micros.append(metrics.average_cpc)
+        cost_micros.append(metrics.cost_micros)
+        conversions.append(metrics.conversions)
+        conversions_value.append(metrics.conversions_value)
+        cost_per_conversion_micros.append(metrics.cost_per_conversion)
+
+    statuses = (
+        [status_enum.values_by_number[number].name for number in status_numbers]
+        if status_enum is not None
+        else []
+    )
+    # The conversion helpers are inlined here: this runs once per value of
+    # every exported row, where the extra call per value adds up.
+    average_cpc = [
+        None if value is None else round(value / _MICROS, 2)
+        for value in average_cpc_micros
+    ]
+    columns = zip(
+        ids,
+        names,
+        statuses,
+        map(int, impressions),
+        map(int, clicks),
+        [None if value is None else round(float(value) * 100, 2) for value in ctr],
+        [
+            None if value is None else round(float(value), 4)
+            for value in search_impression_share
+        ],
+        average_cpc,
+        average_cpc,
+        [None if value is None else round(value / _MICROS, 2) for value in cost_micros],
+        [
+            (None if value is None else round(float(value), 2)) or 0.0
+            for value in conversions
+        ],
+        [
+            None if value is None else round(float(value), 2)
+            for value in conversions_value
+        ],
+        [
+            None if value is None else round(value / _MICROS, 2)
+            for value in cost_per_conversion_micros
+        ],
+    )
+    return [CampaignRow(*values) for values in columns]
 
 
 def _format_google_ads_error(ex: GoogleAdsException) -> str:
@@ -200,43 +400,24 @@ def _format_google_ads_error(ex: GoogleAdsException) -> str:
 
 
 def _write_csv(path: str, rows: Iterable[CampaignRow]) -> None:
-    headers = [
-        "campaign_id",
-        "campaign_name",
-        "status",
-        "impressions",
-        "clicks",
-        "ctr_percent",
-        "search_impression_share",
-        "average_cpc",
-        "cost_per_click",
-        "cost",
-        "conversions",
-        "conversion_value",
-        "cost_per_conversion",
-    ]
-
-    with open(path, "w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow(
-                [
-                    row.campaign_id,
-                    row.campaign_name,
-                    row.status,
-                    row.impressions,
-                    row.clicks,
-                    row.ctr_percent,
-                    row.search_impression_share,
-                    row.average_cpc,
-                    row.cost_per_click,
-                    row.cost,
-                    row.conversions,
-                    row.conversion_value,
-                    row.cost_per_conversion,
-                ]
-            )
+    # The rows may still be streaming from the API, so write beside the
+    # target and only swap it in once every row has arrived; a failed fetch
+    # leaves the previous export untouched.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(
+            tmp_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE
+        ) as handle:
+            writer = csv.writer(handle)
+            writer.writerow(_HEADERS)
+            writer.writerows(map(_ROW_GETTER, rows))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def _write_google_sheet(
@@ -265,52 +446,32 @@ def _write_google_sheet(
     except WorksheetNotFound:
         worksheet = spreadsheet.add_worksheet(title=sheet_name, rows="100", cols="20")
 
-    data = [
-        [
-            "campaign_id",
-            "campaign_name",
-            "status",
-            "impressions",
-            "clicks",
-            "ctr_percent",
-            "search_impression_share",
-            "average_cpc",
-            "cost_per_click",
-            "cost",
-            "conversions",
-            "conversion_value",
-            "cost_per_conversion",
-        ]
-    ]
-
-    for row in rows:
-        data.append(
-            [
-                row.campaign_id,
-                row.campaign_name,
-                row.status,
-                row.impressions,
-                row.clicks,
-                row.ctr_percent,
-                row.search_impression_share,
-                row.average_cpc,
-                row.cost_per_click,
-                row.cost,
-                row.conversions,
-                row.conversion_value,
-                row.cost_per_conversion,
-            ]
-        )
+    data = [list(_HEADERS)]
+    data.extend(map(list, map(_ROW_GETTER, rows)))
 
     worksheet.clear()
-    worksheet.update("A1", data, value_input_option="USER_ENTERED")
+    # Keep each request under the Sheets API payload limit on large exports.
+    for start in range(0, len(data), _SHEETS_CHUNK_ROWS):
+        worksheet.update(
+            f"A{start + 1}",
+            data[start : start + _SHEETS_CHUNK_ROWS],
+            value_input_option="USER_ENTERED",
+        )
 
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Export Google Ads campaign metrics to CSV and Google Sheets."
     )
-    parser.add_argument("--customer-id", required=True, help="Target client account ID")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--customer-id", help="Target client account ID")
+    target.add_argument(
+        "--customer-ids",
+        help=(
+            "Comma-separated client account IDs, fetched concurrently and "
+            "written to the same outputs"
+        ),
+    )
     parser.add_argument(
         "--login-customer-id",
         help="MCC account ID (required for manager access)",
@@ -366,87 +527,100 @@ def _write_xlsx(path: str, rows: Iterable[CampaignRow]) -> None:
             "Missing Excel dependency. Install: pip install openpyxl"
         ) from ex
 
-    headers = [
-        "campaign_id",
-        "campaign_name",
-        "status",
-        "impressions",
-        "clicks",
-        "ctr_percent",
-        "search_impression_share",
-        "average_cpc",
-        "cost_per_click",
-        "cost",
-        "conversions",
-        "conversion_value",
-        "cost_per_conversion",
-    ]
+    # Write-only mode streams rows into the archive instead of keeping a Cell
+    # object per value in memory.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Campaigns")
+    sheet.append(_HEADERS)
+    for values in map(_ROW_GETTER, rows):
+        sheet.append(values)
 
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = "Campaigns"
-    sheet.append(headers)
-    for row in rows:
-        sheet.append(
-            [
-                row.campaign_id,
-                row.campaign_name,
-                row.status,
-                row.impressions,
-                row.clicks,
-                row.ctr_percent,
-                row.search_impression_share,
-                row.average_cpc,
-                row.cost_per_click,
-                row.cost,
-                row.conversions,
-                row.conversion_value,
-                row.cost_per_conversion,
-            ]
+    workbook.save(path)
+
+
+@dataclass
+class _Totals:
+    campaigns: int = 0
+    impressions: int = 0
+    clicks: int = 0
+    cost: float = 0.0
+    conversions: float = 0.0
+    conversion_value: float = 0.0
+
+    def add(self, row: CampaignRow) -> None:
+        self.campaigns += 1
+        self.impressions += row.impressions
+        self.clicks += row.clicks
+        self.cost += row.cost or 0.0
+        self.conversions += row.conversions or 0.0
+        self.conversion_value += row.conversion_value or 0.0
+
+    def extend(self, rows: Sequence[CampaignRow]) -> None:
+        # Column-wise reductions run the per-element loop in C; filter(None, ...)
+        # drops missing values exactly like the `or 0.0` fallback in add().
+        self.campaigns += len(rows)
+        self.impressions += sum(map(attrgetter("impressions"), rows))
+        self.clicks += sum(map(attrgetter("clicks"), rows))
+        self.cost += sum(filter(None, map(attrgetter("cost"), rows)))
+        self.conversions += sum(filter(None, map(attrgetter("conversions"), rows)))
+        self.conversion_value += sum(
+            filter(None, map(attrgetter("conversion_value"), rows))
         )
 
-    workbook.save(path)
+    def finalize(self) -> CampaignRow:
+        total_impressions = self.impressions
+        total_clicks = self.clicks
+        total_cost = round(self.cost, 2)
+        total_conversions = round(self.conversions, 2)
+        total_conversion_value = round(self.conversion_value, 2)
+
+        ctr_percent = (
+            _ratio_to_percent(total_clicks / total_impressions)
+            if total_impressions
+            else None
+        )
+        average_cpc = round(total_cost / total_clicks, 2) if total_clicks else None
+        cost_per_click = average_cpc
+        cost_per_conversion = (
+            round(total_cost / total_conversions, 2) if total_conversions else None
+        )
 
+        return CampaignRow(
+            campaign_id=0,
+            campaign_name="TOTAL",
+            status="",
+            impressions=total_impressions,
+            clicks=total_clicks,
+            ctr_percent=ctr_percent,
+            search_impression_share=None,
+            average_cpc=average_cpc,
+            cost_per_click=cost_per_click,
+            cost=total_cost,
+            conversions=total_conversions,
+            conversion_value=total_conversion_value,
+            cost_per_conversion=cost_per_conversion,
+        )
 
-def _build_total_row(rows: List[CampaignRow]) -> CampaignRow:
-    total_impressions = sum(row.impressions for row in rows)
-    total_clicks = sum(row.clicks for row in rows)
-    total_cost = round(sum(row.cost or 0.0 for row in rows), 2)
-    total_conversions = round(sum(row.conversions or 0.0 for row in rows), 2)
-    total_conversion_value = round(sum(row.conversion_value or 0.0 for row in rows), 2)
-
-    ctr_percent = (
-        _ratio_to_percent(total_clicks / total_impressions)
-        if total_impressions
-        else None
-    )
-    average_cpc = round(total_cost / total_clicks, 2) if total_clicks else None
-    cost_per_click = average_cpc
-    cost_per_conversion = (
-        round(total_cost / total_conversions, 2) if total_conversions else None
-    )
 
-    return CampaignRow(
-        campaign_id=0,
-        campaign_name="TOTAL",
-        status="",
-        impressions=total_impressions,
-        clicks=total_clicks,
-        ctr_percent=ctr_percent,
-        search_impression_share=None,
-        average_cpc=average_cpc,
-        cost_per_click=cost_per_click,
-        cost=total_cost,
-        conversions=total_conversions,
-        conversion_value=total_conversion_value,
-        cost_per_conversion=cost_per_conversion,
-    )
+def _build_total_row(rows: List[CampaignRow]) -> CampaignRow:
+    totals = _Totals()
+    totals.extend(rows)
+    return totals.finalize()
 
 
 def _rows_with_total(rows: List[CampaignRow]) -> List[CampaignRow]:
     return rows + [_build_total_row(rows)]
 
 
+def _iter_with_total(
+    rows: Iterable[CampaignRow], totals: _Totals
+) -> Iterator[CampaignRow]:
+    for row in rows:
+        totals.add(row)
+        yield row
+    yield totals.finalize()
+
+
 def main() -> None:
     parser = _build_parser()
     args = parser.parse_args()
@@ -464,18 +638,35 @@ def main() -> None:
         )
 
     client = _build_client(args)
-    rows = _fetch_campaigns(client, args.customer_id, args.days)
-    rows_with_total = _rows_with_total(rows)
+    if args.customer_ids:
+        customer_ids = [cid for cid in args.customer_ids.split(",") if cid.strip()]
+        try:
+            max_workers = _parse_concurrency(os.getenv("GOOGLE_ADS_CONCURRENCY"))
+        except ValueError as ex:
+            parser.error(str(ex))
+        campaigns = _iter_campaigns_concurrently(
+            client, customer_ids, args.days, max_workers
+        )
+    else:
+        campaigns = _iter_campaigns(client, args.customer_id, args.days)
+
+    totals = _Totals()
+    rows_with_total: Iterable[CampaignRow] = _iter_with_total(campaigns, totals)
+    # Only materialize the rows when more than one writer needs them; a plain
+    # CSV export streams straight from the API to disk.
+    if args.output_xlsx or args.sheet_id:
+        rows_with_total = list(rows_with_total)
 
     _write_csv(args.output, rows_with_total)
     print(
-        f"CSV written: {args.output} ({len(rows)} campaigns + total row)"
+        f"CSV written: {args.output} ({totals.campaigns} campaigns + total row)"
     )
 
     if args.output_xlsx:
         _write_xlsx(args.output_xlsx, rows_with_total)
         print(
-            f"XLSX written: {args.output_xlsx} ({len(rows)} campaigns + total row)"
+            f"XLSX written: {args.output_xlsx} "
+            f"({totals.campaigns} campaigns + total row)"
         )
 
     if args.sheet_id:
@@ -2,11 +2,31 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
 import json
 import os
-from dataclasses import dataclass
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from datetime import date, timedelta
-from typing import Dict, Iterable, List, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_HTTP_POOL_SIZE = 8
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*([^#\s=][^=\r\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.MULTILINE
+)
+
+_session = None
+_session_lock = threading.Lock()
 
 
 @dataclass
@@ -29,6 +49,10 @@ class MetaCampaignRow:
     conversion_value: Optional[float]
 
 
+_HEADERS = tuple(field.name for field in fields(MetaCampaignRow))
+_ROW_GETTER = attrgetter(*_HEADERS)
+
+
 def _load_env_file(path: Optional[str]) -> None:
     if not path:
         return
@@ -36,16 +60,13 @@ def _load_env_file(path: Optional[str]) -> None:
         raise FileNotFoundError(f"Env file not found: {path}")
 
     with open(path, "r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip("'\"")
-            if not value:
-                continue
-            os.environ.setdefault(key, value)
+        text = handle.read()
+
+    for match in _ENV_LINE_RE.finditer(text):
+        value = match.group(2).strip("'\"")
+        if not value:
+            continue
+        os.environ.setdefault(match.group(1), value)
 
 
 def _resolve_env_file(args: argparse.Namespace) -> Optional[str]:
@@ -58,6 +79,7 @@ def _resolve_env_file(args: argparse.Namespace) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=32)
 def _ensure_act_prefix(ad_account_id: str) -> str:
     ad_account_id = ad_account_id.strip()
     if not ad_account_id.startswith("act_"):
@@ -66,9 +88,14 @@ def _ensure_act_prefix(ad_account_id: str) -> str:
 
 
 def _date_range(days: int) -> Dict[str, str]:
-    end = date.today()
+    since, until = _date_bounds(days, date.today())
+    return {"since": since, "until": until}
+
+
+@lru_cache(maxsize=8)
+def _date_bounds(days: int, end: date) -> Tuple[str, str]:
     start = end - timedelta(days=days - 1)
-    return {"since": start.isoformat(), "until": end.isoformat()}
+    return start.isoformat(), end.isoformat()
 
 
 def _to_int(value: Optional[str]) -> int:
@@ -83,16 +110,32 @@ def _to_float(value: Optional[str], digits: int = 2) -> Optional[float]:
     return round(float(value), digits)
 
 
-def _get_action_value(actions: Optional[List[dict]], action_type: str) -> float:
-    if not actions:
+def _index_actions(actions: Optional[List[dict]]) -> Dict[str, dict]:
+    # Reversed so the first entry for a duplicated action_type wins, matching
+    # the original linear scan.
+    return {item.get("action_type"): item for item in reversed(actions or [])}
+
+
+def _action_value(actions_by_type: Dict[str, dict], action_type: str) -> float:
+    item = actions_by_type.get(action_type)
+    if item is None:
+        return 0.0
+    try:
+        return float(item.get("value", 0) or 0)
+    except ValueError:
         return 0.0
-    for item in actions:
-        if item.get("action_type") == action_type:
-            try:
-                return float(item.get("value", 0) or 0)
-            except ValueError:
-                return 0.0
-    return 0.0
+
+
+def _json_loads(payload: bytes):
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _json_dumps(value) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
 
 
 def _require_requests():
@@ -102,14 +145,29 @@ def _require_requests():
         raise RuntimeError("Missing dependency. Install: pip install requests") from ex
 
 
-def _graph_get(version: str, path: str, params: Dict[str, str], access_token: str):
-    import requests
+def _get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                _session = session
+    return _session
 
+
+def _graph_get(version: str, path: str, params: Dict[str, str], access_token: str):
     url = f"https://graph.facebook.com/{version}/{path}"
     params = dict(params)
     params["access_token"] = access_token
-    response = requests.get(url, params=params, timeout=30)
-    data = response.json()
+    response = _get_session().get(url, params=params, timeout=30)
+    data = _json_loads(response.content)
     if response.status_code >= 400:
         raise RuntimeError(f"Graph API error: {data}")
     if "error" in data:
@@ -118,10 +176,8 @@ def _graph_get(version: str, path: str, params: Dict[str, str], access_token: st
 
 
 def _graph_get_url(url: str):
-    import requests
-
-    response = requests.get(url, timeout=30)
-    data = response.json()
+    response = _get_session().get(url, timeout=30)
+    data = _json_loads(response.content)
     if response.status_code >= 400:
         raise RuntimeError(f"Graph API error: {data}")
     if "error" in data:
@@ -130,14 +186,18 @@ def _graph_get_url(url: str):
 
 
 def _paginate(version: str, path: str, params: Dict[str, str], access_token: str):
+    # Prefetch the next page in the background while the caller consumes the
+    # current one, so each page's round-trip overlaps with processing.
     data = _graph_get(version, path, params, access_token)
-    while True:
-        for item in data.get("data", []):
-            yield item
-        next_url = data.get("paging", {}).get("next")
-        if not next_url:
-            break
-        data = _graph_get_url(next_url)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while True:
+            next_url = data.get("paging", {}).get("next")
+            future = executor.submit(_graph_get_url, next_url) if next_url else None
+            for item in data.get("data", []):
+                yield item
+            if future is None:
+                break
+            data = future.result()
 
 
 def _fetch_campaigns(
@@ -181,7 +241,7 @@ def _fetch_insights(
     params = {
         "level": "campaign",
         "fields": fields,
-        "time_range": json.dumps(_date_range(days)),
+        "time_range": _json_dumps(_date_range(days)),
         "limit": "200",
     }
 
@@ -199,10 +259,10 @@ def _merge_rows(
         campaign_meta = campaigns.get(campaign_id, {})
         status = campaign_meta.get("effective_status") or campaign_meta.get("status") or ""
         objective = campaign_meta.get("objective") or ""
-        conversions = _get_action_value(row.get("actions"), conversion_action)
-        conversion_value = _get_action_value(
-            row.get("action_values"), conversion_action
-        )
+        actions_by_type = _index_actions(row.get("actions"))
+        values_by_type = _index_actions(row.get("action_values"))
+        conversions = _action_value(actions_by_type, conversion_action)
+        conversion_value = _action_value(values_by_type, conversion_action)
 
         rows.append(
             MetaCampaignRow(
@@ -227,91 +287,89 @@ def _merge_rows(
     return rows
 
 
-def _build_total_row(rows: List[MetaCampaignRow]) -> MetaCampaignRow:
-    total_impressions = sum(row.impressions for row in rows)
-    total_clicks = sum(row.clicks for row in rows)
-    total_inline_link_clicks = sum(row.inline_link_clicks for row in rows)
-    total_unique_clicks = sum(row.unique_clicks for row in rows)
-    total_reach = sum(row.reach for row in rows)
-    total_spend = round(sum(row.spend or 0.0 for row in rows), 2)
-    total_conversions = round(sum(row.conversions or 0.0 for row in rows), 2)
-    total_conversion_value = round(
-        sum(row.conversion_value or 0.0 for row in rows), 2
-    )
+@dataclass
+class _Totals:
+    campaigns: int = 0
+    impressions: int = 0
+    clicks: int = 0
+    inline_link_clicks: int = 0
+    unique_clicks: int = 0
+    reach: int = 0
+    spend: float = 0.0
+    conversions: float = 0.0
+    conversion_value: float = 0.0
+
+    def extend(self, rows: Sequence[MetaCampaignRow]) -> None:
+        # One column at a time so the loops run in C; filter(None, ...) skips
+        # missing spend and conversion values.
+        self.campaigns += len(rows)
+        self.impressions += sum(map(attrgetter("impressions"), rows))
+        self.clicks += sum(map(attrgetter("clicks"), rows))
+        self.inline_link_clicks += sum(map(attrgetter("inline_link_clicks"), rows))
+        self.unique_clicks += sum(map(attrgetter("unique_clicks"), rows))
+        self.reach += sum(map(attrgetter("reach"), rows))
+        self.spend += sum(filter(None, map(attrgetter("spend"), rows)))
+        self.conversions += sum(filter(None, map(attrgetter("conversions"), rows)))
+        self.conversion_value += sum(
+            filter(None, map(attrgetter("conversion_value"), rows))
+        )
 
-    ctr_percent = (
-        round((total_clicks / total_impressions) * 100, 2)
-        if total_impressions
-        else None
-    )
-    cpc = round(total_spend / total_clicks, 2) if total_clicks else None
-    cpm = round((total_spend / total_impressions) * 1000, 2) if total_impressions else None
-    frequency = round(total_impressions / total_reach, 2) if total_reach else None
-
-    return MetaCampaignRow(
-        campaign_id="TOTAL",
-        campaign_name="TOTAL",
-        status="",
-        objective="",
-        impressions=total_impressions,
-        clicks=total_clicks,
-        inline_link_clicks=total_inline_link_clicks,
-        unique_clicks=total_unique_clicks,
-        reach=total_reach,
-        frequency=frequency,
-        ctr_percent=ctr_percent,
-        cpc=cpc,
-        cpm=cpm,
-        spend=total_spend,
-        conversions=total_conversions,
-        conversion_value=total_conversion_value,
-    )
+    def finalize(self) -> MetaCampaignRow:
+        total_impressions = self.impressions
+        total_clicks = self.clicks
+        total_reach = self.reach
+        total_spend = round(self.spend, 2)
+        total_conversions = round(self.conversions, 2)
+        total_conversion_value = round(self.conversion_value, 2)
+
+        ctr_percent = (
+            round((total_clicks / total_impressions) * 100, 2)
+            if total_impressions
+            else None
+        )
+        cpc = round(total_spend / total_clicks, 2) if total_clicks else None
+        cpm = (
+            round((total_spend / total_impressions) * 1000, 2)
+            if total_impressions
+            else None
+        )
+        frequency = round(total_impressions / total_reach, 2) if total_reach else None
+
+        return MetaCampaignRow(
+            campaign_id="TOTAL",
+            campaign_name="TOTAL",
+            status="",
+            objective="",
+            impressions=total_impressions,
+            clicks=total_clicks,
+            inline_link_clicks=self.inline_link_clicks,
+            unique_clicks=self.unique_clicks,
+            reach=total_reach,
+            frequency=frequency,
+            ctr_percent=ctr_percent,
+            cpc=cpc,
+            cpm=cpm,
+            spend=total_spend,
+            conversions=total_conversions,
+            conversion_value=total_conversion_value,
+        )
+
+
+def _build_total_row(rows: List[MetaCampaignRow]) -> MetaCampaignRow:
+    totals = _Totals()
+    totals.extend(rows)
+    return totals.finalize()
 
 
 def _write_csv(path: str, rows: Iterable[MetaCampaignRow]) -> None:
-    headers = [
-        "campaign_id",
-        "campaign_name",
-        "status",
-        "objective",
-        "impressions",
-        "clicks",
-        "inline_link_clicks",
-        "unique_clicks",
-        "reach",
-        "frequency",
-        "ctr_percent",
-        "cpc",
-        "cpm",
-        "spend",
-        "conversions",
-        "conversion_value",
-    ]
-
-    with open(path, "w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow(
-                [
-                    row.campaign_id,
-                    row.campaign_name,
-                    row.status,
-                    row.objective,
-                    row.impressions,
-                    row.clicks,
-                    row.inline_link_clicks,
-                    row.unique_clicks,
-                    row.reach,
-                    row.frequency,
-                    row.ctr_percent,
-                    row.cpc,
-                    row.cpm,
-                    row.spend,
-                    row.conversions,
-                    row.conversion_value,
-                ]
-            )
+    # Meta exports are already fully in memory, so render the CSV into one
+    # buffer and hand it to the OS in a single write.
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(_HEADERS)
+    writer.writerows(map(_ROW_GETTER, rows))
+    with open(path, "wb") as handle:
+        handle.write(buffer.getvalue().encode("utf-8"))
 
 
 def _write_xlsx(path: str, rows: Iterable[MetaCampaignRow]) -> None:
@@ -320,50 +378,11 @@ def _write_xlsx(path: str, rows: Iterable[MetaCampaignRow]) -> None:
     except ImportError as ex:
         raise RuntimeError("Missing dependency. Install: pip install openpyxl") from ex
 
-    headers = [
-        "campaign_id",
-        "campaign_name",
-        "status",
-        "objective",
-        "impressions",
-        "clicks",
-        "inline_link_clicks",
-        "unique_clicks",
-        "reach",
-        "frequency",
-        "ctr_percent",
-        "cpc",
-        "cpm",
-        "spend",
-        "conversions",
-        "conversion_value",
-    ]
-
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = "Meta Campaigns"
-    sheet.append(headers)
-    for row in rows:
-        sheet.append(
-            [
-                row.campaign_id,
-                row.campaign_name,
-                row.status,
-                row.objective,
-                row.impressions,
-                row.clicks,
-                row.inline_link_clicks,
-                row.unique_clicks,
-                row.reach,
-                row.frequency,
-                row.ctr_percent,
-                row.cpc,
-                row.cpm,
-                row.spend,
-                row.conversions,
-                row.conversion_value,
-            ]
-        )
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Meta Campaigns")
+    sheet.append(_HEADERS)
+    for values in map(_ROW_GETTER, rows):
+        sheet.append(values)
 
     workbook.save(path)
 
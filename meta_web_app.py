@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from types import SimpleNamespace
-from typing import List
+from typing import Dict, List, Tuple
 
-from flask import Flask, request, render_template_string
+from flask import Flask, request
 
 import meta_export_campaigns as meta
 
 
 app = Flask(__name__)
+_fetch_cache: Dict[Tuple[str, str, str, int], Tuple[float, dict, list]] = {}
+_fetch_cache_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="meta-fetch")
+_DEFAULT_DAYS = 30
 
 TEMPLATE = """
 <!doctype html>
@@ -74,7 +83,7 @@ TEMPLATE = """
   </head>
   <body>
     <h1>Meta Ads Campaigns</h1>
-    <div class="meta">Fetched at {{ fetched_at }}</div>
+    <div class="meta">Fetched at <span id="fetched-at">-</span></div>
 
     <form method="get">
       <div>
@@ -90,10 +99,10 @@ TEMPLATE = """
       </div>
     </form>
 
-    {% if error %}
-      <div class="error">{{ error }}</div>
-    {% elif rows %}
-      <table>
+    {% if ad_account_id %}
+      <div class="error" id="error" hidden></div>
+      <div class="meta" id="loading">Loading campaigns...</div>
+      <table id="campaigns" hidden>
         <thead>
           <tr>
             {% for header in headers %}
@@ -101,29 +110,46 @@ TEMPLATE = """
             {% endfor %}
           </tr>
         </thead>
-        <tbody>
-          {% for row in rows %}
-            <tr class="{{ 'total-row' if row.campaign_name == 'TOTAL' else '' }}">
-              <td>{{ row.campaign_id }}</td>
-              <td>{{ row.campaign_name }}</td>
-              <td>{{ row.status }}</td>
-              <td>{{ row.objective }}</td>
-              <td>{{ row.impressions }}</td>
-              <td>{{ row.clicks }}</td>
-              <td>{{ row.inline_link_clicks }}</td>
-              <td>{{ row.unique_clicks }}</td>
-              <td>{{ row.reach }}</td>
-              <td>{{ row.frequency }}</td>
-              <td>{{ row.ctr_percent }}</td>
-              <td>{{ row.cpc }}</td>
-              <td>{{ row.cpm }}</td>
-              <td>{{ row.spend }}</td>
-              <td>{{ row.conversions }}</td>
-              <td>{{ row.conversion_value }}</td>
-            </tr>
-          {% endfor %}
-        </tbody>
+        <tbody></tbody>
       </table>
+      <script>
+        (function () {
+          const headers = {{ headers | tojson }};
+          const params = new URLSearchParams({
+            ad_account_id: {{ ad_account_id | tojson }},
+            days: {{ days | tojson }},
+          });
+          const table = document.getElementById("campaigns");
+          const errorEl = document.getElementById("error");
+          const loadingEl = document.getElementById("loading");
+
+          const showError = (message) => {
+            loadingEl.hidden = true;
+            errorEl.textContent = message;
+            errorEl.hidden = false;
+          };
+
+          fetch("/api/campaigns?" + params.toString())
+            .then((response) => response.json())
+            .then((data) => {
+              if (data.error) {
+                showError(data.error);
+                return;
+              }
+              const body = table.tBodies[0];
+              const nameIndex = headers.indexOf("campaign_name");
+              for (const cells of data.rows) {
+                const tr = body.insertRow();
+                if (cells[nameIndex] === "TOTAL") tr.className = "total-row";
+                for (const cell of cells) tr.insertCell().textContent = cell;
+              }
+              document.getElementById("fetched-at").textContent = data.fetched_at;
+              loadingEl.hidden = true;
+              table.hidden = false;
+            })
+            .catch((ex) => showError(String(ex)));
+        })();
+      </script>
     {% else %}
       <div class="meta">Enter an ad account ID to load campaigns.</div>
     {% endif %}
@@ -131,6 +157,10 @@ TEMPLATE = """
 </html>
 """
 
+# Compiled once at import; render_template_string would hash and look up the
+# source on every request.
+_INDEX_TEMPLATE = app.jinja_env.from_string(TEMPLATE)
+
 
 def _load_env_if_present() -> None:
     args = SimpleNamespace(env_file=None)
@@ -139,82 +169,153 @@ def _load_env_if_present() -> None:
         meta._load_env_file(env_file)
 
 
+_load_env_if_present()
+# Build the pooled Graph API session up front so every request thread reuses
+# the same keep-alive connections from the first page view on.
+meta._get_session()
+
+
 def _default_ad_account_id() -> str | None:
     return os.getenv("META_AD_ACCOUNT_ID")
 
 
+def _parse_days(raw: str | None) -> int:
+    # Junk falls back to the default instead of raising; the range matches the
+    # form's min/max.
+    days = int(raw) if raw and raw.isdecimal() else _DEFAULT_DAYS
+    return max(1, min(days, 365))
+
+
+def _cache_seconds() -> float:
+    return float(os.getenv("META_CACHE_SECONDS", "60"))
+
+
+def _json_response(payload: dict, status: int = 200):
+    # orjson returns bytes and skips the str round trip; the stdlib is the
+    # fallback when it is not installed.
+    if meta.orjson is not None:
+        body = meta.orjson.dumps(payload)
+    else:
+        body = json.dumps(payload)
+    return app.response_class(body, status=status, mimetype="application/json")
+
+
+def _fetch_account_data_uncached(
+    api_version: str, ad_account_id: str, access_token: str, days: int
+) -> Tuple[Dict[str, dict], List[dict]]:
+    # The two Graph API calls are independent; run them side by side so the
+    # page waits for the slower one rather than both in sequence.
+    campaigns_future = _executor.submit(
+        meta._fetch_campaigns, api_version, ad_account_id, access_token
+    )
+    insights = meta._fetch_insights(api_version, ad_account_id, access_token, days)
+    return campaigns_future.result(), insights
+
+
+def _fetch_account_data(
+    api_version: str, ad_account_id: str, access_token: str, days: int
+) -> Tuple[Dict[str, dict], List[dict]]:
+    ttl = _cache_seconds()
+    if ttl <= 0:
+        return _fetch_account_data_uncached(
+            api_version, ad_account_id, access_token, days
+        )
+
+    token_hash = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    key = (api_version, ad_account_id, token_hash, days)
+    now = time.monotonic()
+    with _fetch_cache_lock:
+        cached = _fetch_cache.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[1], cached[2]
+
+    campaigns, insights = _fetch_account_data_uncached(
+        api_version, ad_account_id, access_token, days
+    )
+    with _fetch_cache_lock:
+        expired = [
+            cache_key
+            for cache_key, (stored_at, _, _) in _fetch_cache.items()
+            if now - stored_at >= ttl
+        ]
+        for cache_key in expired:
+            del _fetch_cache[cache_key]
+        _fetch_cache[key] = (now, campaigns, insights)
+    return campaigns, insights
+
+
 @app.route("/", methods=["GET"])
 def index():
-    _load_env_if_present()
+    if app.debug:
+        _load_env_if_present()
     ad_account_id = request.args.get("ad_account_id") or _default_ad_account_id()
-    days = int(request.args.get("days", 30))
-    fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    days = _parse_days(request.args.get("days"))
+    if ad_account_id:
+        ad_account_id = meta._ensure_act_prefix(ad_account_id)
 
-    if not ad_account_id:
-        return render_template_string(
-            TEMPLATE,
+    # The shell only depends on the URL and the default account; the campaign
+    # data is loaded by the page from /api/campaigns, so browsers can keep
+    # the HTML around. It embeds the server's default account, so keep it out
+    # of shared caches and let it go stale no later than the data it shows.
+    response = app.response_class(
+        _INDEX_TEMPLATE.render(
             ad_account_id=ad_account_id,
             days=days,
-            fetched_at=fetched_at,
-            headers=[],
-            rows=[],
-            error=None,
-        )
+            headers=meta._HEADERS,
+        ),
+        mimetype="text/html",
+    )
+    response.headers["Cache-Control"] = f"private, max-age={int(_cache_seconds())}"
+    return response
 
-    try:
-        access_token = os.getenv("META_ACCESS_TOKEN")
-        api_version = os.getenv("META_API_VERSION") or "v22.0"
-        conversion_action = os.getenv("META_CONVERSION_ACTION") or "offsite_conversion"
-        if not access_token:
-            raise RuntimeError("Missing META_ACCESS_TOKEN (set it in .env)")
 
-        ad_account_id = meta._ensure_act_prefix(ad_account_id)
-        campaigns = meta._fetch_campaigns(api_version, ad_account_id, access_token)
-        insights = meta._fetch_insights(api_version, ad_account_id, access_token, days)
-        rows: List[meta.MetaCampaignRow] = meta._merge_rows(
-            campaigns, insights, conversion_action
+@app.route("/api/campaigns", methods=["GET"])
+def api_campaigns():
+    if app.debug:
+        _load_env_if_present()
+    ad_account_id = request.args.get("ad_account_id") or _default_ad_account_id()
+    days = _parse_days(request.args.get("days"))
+    fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    if not ad_account_id:
+        return _json_response({"error": "Missing ad_account_id"}, 400)
+
+    access_token = os.getenv("META_ACCESS_TOKEN")
+    api_version = os.getenv("META_API_VERSION") or "v22.0"
+    conversion_action = os.getenv("META_CONVERSION_ACTION") or "offsite_conversion"
+    if not access_token:
+        return _json_response(
+            {"error": "Missing META_ACCESS_TOKEN (set it in .env)"}, 500
         )
-        rows = rows + [meta._build_total_row(rows)]
-
-        headers = [
-            "campaign_id",
-            "campaign_name",
-            "status",
-            "objective",
-            "impressions",
-            "clicks",
-            "inline_link_clicks",
-            "unique_clicks",
-            "reach",
-            "frequency",
-            "ctr_percent",
-            "cpc",
-            "cpm",
-            "spend",
-            "conversions",
-            "conversion_value",
-        ]
 
-        return render_template_string(
-            TEMPLATE,
-            ad_account_id=ad_account_id,
-            days=days,
-            fetched_at=fetched_at,
-            headers=headers,
-            rows=rows,
-            error=None,
+    ad_account_id = meta._ensure_act_prefix(ad_account_id)
+    try:
+        campaigns, insights = _fetch_account_data(
+            api_version, ad_account_id, access_token, days
         )
     except Exception as ex:
-        return render_template_string(
-            TEMPLATE,
-            ad_account_id=ad_account_id,
-            days=days,
-            fetched_at=fetched_at,
-            headers=[],
-            rows=[],
-            error=str(ex),
-        )
+        return _json_response({"error": str(ex)}, 502)
+
+    rows: List[meta.MetaCampaignRow] = meta._merge_rows(
+        campaigns, insights, conversion_action
+    )
+    # Cells are formatted here, in header order, so the table reads exactly
+    # as the server-rendered one did (12.0 stays "12.0", None stays "None");
+    # JSON numbers would lose that once parsed in the browser.
+    payload = {
+        "ad_account_id": ad_account_id,
+        "fetched_at": fetched_at,
+        "rows": [
+            list(map(str, meta._ROW_GETTER(row)))
+            for row in rows + [meta._build_total_row(rows)]
+        ],
+    }
+    response = _json_response(payload)
+    response.headers["Cache-Control"] = f"private, max-age={int(_cache_seconds())}"
+    return response
 
 
 if __name__ == "__main__":
-    app.run(debug=False)
+    # Development only; deploy behind gunicorn so slow Graph API calls from one
+    # visitor do not hold up others: gunicorn -w 4 --threads 8 meta_web_app:app
+    app.run(debug=False, threaded=True)
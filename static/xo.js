@@ -0,0 +1,98 @@
+(function () {
+  const canvas = document.getElementById("xo-canvas");
+  const ctx = canvas.getContext("2d");
+  const resetBtn = document.getElementById("xo-reset");
+  const winnerEl = document.getElementById("xo-winner");
+  const turnEl = document.getElementById("xo-turn");
+
+  const size = 3;
+  const cell = 80;
+  // Each player's marks are a 9-bit mask, bit (y * 3 + x) per cell.
+  const FULL = 0b111111111;
+  const WINS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+  ];
+  let xMarks = 0;
+  let oMarks = 0;
+  let current = "X";
+  let winner = "";
+
+  const drawGrid = () => {
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.strokeStyle = "#e5e7eb";
+    ctx.lineWidth = 2;
+    for (let i = 1; i < size; i++) {
+      ctx.beginPath();
+      ctx.moveTo(i * cell, 0);
+      ctx.lineTo(i * cell, canvas.height);
+      ctx.stroke();
+      ctx.beginPath();
+      ctx.moveTo(0, i * cell);
+      ctx.lineTo(canvas.width, i * cell);
+      ctx.stroke();
+    }
+  };
+
+  const drawMarks = () => {
+    ctx.font = "48px Arial";
+    ctx.textAlign = "center";
+    ctx.textBaseline = "middle";
+    for (let y = 0; y < size; y++) {
+      for (let x = 0; x < size; x++) {
+        const bit = 1 << (y * size + x);
+        if (!((xMarks | oMarks) & bit)) continue;
+        const value = xMarks & bit ? "X" : "O";
+        ctx.fillStyle = value === "X" ? "#e2e8f0" : "#60a5fa";
+        ctx.fillText(value, x * cell + cell / 2, y * cell + cell / 2);
+      }
+    }
+  };
+
+  const checkWinner = () => {
+    for (const win of WINS) {
+      if ((xMarks & win) === win) return "X";
+      if ((oMarks & win) === win) return "O";
+    }
+    return "";
+  };
+
+  const isDraw = () => ((xMarks | oMarks) & FULL) === FULL;
+
+  const render = () => {
+    drawGrid();
+    drawMarks();
+    winnerEl.textContent = winner || "-";
+    turnEl.textContent = current;
+  };
+
+  const reset = () => {
+    xMarks = 0;
+    oMarks = 0;
+    current = "X";
+    winner = "";
+    render();
+  };
+
+  canvas.addEventListener("click", (event) => {
+    if (winner) return;
+    const rect = canvas.getBoundingClientRect();
+    const x = Math.floor((event.clientX - rect.left) / cell);
+    const y = Math.floor((event.clientY - rect.top) / cell);
+    // The canvas border is inside the client rect, so edge clicks land
+    // one cell past the board and would alias onto another square's bit.
+    if (x < 0 || x >= size || y < 0 || y >= size) return;
+    const bit = 1 << (y * size + x);
+    if ((xMarks | oMarks) & bit) return;
+    if (current === "X") xMarks |= bit;
+    else oMarks |= bit;
+    winner = checkWinner();
+    if (!winner && isDraw()) winner = "Draw";
+    if (!winner) current = current === "X" ? "O" : "X";
+    render();
+  });
+
+  resetBtn.addEventListener("click", reset);
+  render();
+})();
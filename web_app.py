@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import calendar
+import hashlib
 import os
+import random
 import re
 import sqlite3
 import threading
-from datetime import datetime, timedelta
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import chain
 from types import SimpleNamespace
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from flask import Flask, redirect, render_template_string, request, url_for
+from flask import Flask, redirect, request, stream_with_context, url_for
+from jinja2 import Template
 
 import export_campaigns as ads
 
@@ -22,6 +31,44 @@ _scheduler_started = False
 _scheduler_stop_event = threading.Event()
 _scheduler_backoff_until: Optional[datetime] = None
 _scheduler_forced_enabled = False
+_config_loaded = False
+_run_once_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="ads-runonce"
+)
+_run_once_jobs: Dict[str, Future] = {}
+# Runs the history page's aggregate queries alongside the ones it needs on
+# the request thread; each worker keeps its own reader via _get_conn().
+_history_read_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="ads-history"
+)
+_run_once_lock = threading.Lock()
+_scheduler_failures = 0
+_SCHEDULER_BACKOFF_MULTIPLIER = 1.3
+_SCHEDULER_BACKOFF_CAP_SECONDS = 3600
+_db_local = threading.local()
+_writer_conn: Optional[sqlite3.Connection] = None
+_writer_lock = threading.Lock()
+_db_initialized = False
+_db_init_lock = threading.Lock()
+# (series key, bucket seconds, label format, buckets shown) per run chart.
+_RUN_CHART_WINDOWS = (
+    ("day", 86400, "%Y-%m-%d", 30),
+    ("hour", 3600, "%Y-%m-%d %H", 24),
+    ("bucket", 300, "%Y-%m-%d %H:%M", 72),
+)
+_OPTIMIZE_EVERY_RUNS = 100
+_ANALYZE_EVERY_RUNS = 1000
+_BACKOFF_TOKENS = ("Resource has been exhausted", "429")
+_RETRY_RE = re.compile(r"Retry in (\d+) seconds")
+_STATIC_MAX_AGE_SECONDS = 31536000
+_GZIP_MIN_BYTES = 500
+_static_versions: Dict[str, str] = {}
+# Revalidate on every load (the ETag turns an unchanged page into a 304), and
+# keep shared proxies from storing a page that shows account data.
+_HISTORY_CACHE_CONTROL = "private, no-cache"
+_chart_series_lock = threading.Lock()
+_chart_series_etag: Optional[str] = None
+_chart_series: Dict[str, dict] = {}
 
 TEMPLATE = """
 <!doctype html>
@@ -30,85 +77,7 @@ TEMPLATE = """
     <meta charset="utf-8" />
     <meta name="viewport" content="width=device-width, initial-scale=1" />
     <title>Google Ads Campaigns</title>
-    <style>
-      :root { color-scheme: light; }
-      body {
-        font-family: "Segoe UI", Tahoma, Arial, sans-serif;
-        margin: 24px;
-        color: #1f2937;
-      }
-      h1 { margin: 0 0 8px; }
-      form { margin: 16px 0 24px; display: flex; gap: 12px; flex-wrap: wrap; }
-      label { font-weight: 600; }
-      input {
-        padding: 6px 10px;
-        border: 1px solid #cbd5f1;
-        border-radius: 6px;
-      }
-      button {
-        background: #1f2937;
-        color: white;
-        border: none;
-        border-radius: 6px;
-        padding: 8px 14px;
-        cursor: pointer;
-      }
-      table {
-        width: 100%;
-        border-collapse: collapse;
-        font-size: 14px;
-      }
-      th, td {
-        border-bottom: 1px solid #e5e7eb;
-        padding: 8px 10px;
-        text-align: right;
-        white-space: nowrap;
-      }
-      th:first-child, td:first-child,
-      th:nth-child(2), td:nth-child(2),
-      th:nth-child(3), td:nth-child(3) {
-        text-align: left;
-      }
-      tr.total-row {
-        font-weight: 700;
-        background: #f8fafc;
-      }
-      .meta { color: #6b7280; font-size: 13px; margin-bottom: 8px; }
-      .error {
-        background: #fee2e2;
-        border: 1px solid #fecaca;
-        padding: 12px;
-        border-radius: 8px;
-        color: #991b1b;
-      }
-      .mini-game {
-        margin-top: 16px;
-        padding: 12px;
-        border: 1px solid #e5e7eb;
-        border-radius: 8px;
-        background: #f9fafb;
-        max-width: 420px;
-      }
-      .mini-game h2 {
-        margin: 0 0 8px;
-        font-size: 16px;
-      }
-      .mini-game .score {
-        font-weight: 700;
-      }
-      .mini-game .row {
-        display: flex;
-        gap: 8px;
-        align-items: center;
-        flex-wrap: wrap;
-      }
-      .mini-game canvas {
-        display: block;
-        background: #0f172a;
-        border: 1px solid #111827;
-        border-radius: 6px;
-      }
-    </style>
+    <link rel="stylesheet" href="{{ static_url('app.css') }}" />
   </head>
   <body>
     <h1>Google Ads Campaigns</h1>
@@ -166,7 +135,7 @@ TEMPLATE = """
         </thead>
         <tbody>
           {% for row in rows %}
-            <tr class="{{ 'total-row' if row.campaign_name == 'TOTAL' else '' }}">
+            <tr class="{{ row.css_class }}">
               <td>{{ row.campaign_id }}</td>
               <td>{{ row.campaign_name }}</td>
               <td>{{ row.status }}</td>
@@ -188,100 +157,7 @@ TEMPLATE = """
       <div class="meta">Enter a customer ID to load campaigns.</div>
     {% endif %}
 
-    <script>
-      (function () {
-        const canvas = document.getElementById("xo-canvas");
-        const ctx = canvas.getContext("2d");
-        const resetBtn = document.getElementById("xo-reset");
-        const winnerEl = document.getElementById("xo-winner");
-        const turnEl = document.getElementById("xo-turn");
-
-        const size = 3;
-        const cell = 80;
-        const board = Array.from({ length: size }, () => Array(size).fill(""));
-        let current = "X";
-        let winner = "";
-
-        const drawGrid = () => {
-          ctx.clearRect(0, 0, canvas.width, canvas.height);
-          ctx.strokeStyle = "#e5e7eb";
-          ctx.lineWidth = 2;
-          for (let i = 1; i < size; i++) {
-            ctx.beginPath();
-            ctx.moveTo(i * cell, 0);
-            ctx.lineTo(i * cell, canvas.height);
-            ctx.stroke();
-            ctx.beginPath();
-            ctx.moveTo(0, i * cell);
-            ctx.lineTo(canvas.width, i * cell);
-            ctx.stroke();
-          }
-        };
-
-        const drawMarks = () => {
-          ctx.font = "48px Arial";
-          ctx.textAlign = "center";
-          ctx.textBaseline = "middle";
-          for (let y = 0; y < size; y++) {
-            for (let x = 0; x < size; x++) {
-              const value = board[y][x];
-              if (!value) continue;
-              ctx.fillStyle = value === "X" ? "#e2e8f0" : "#60a5fa";
-              ctx.fillText(value, x * cell + cell / 2, y * cell + cell / 2);
-            }
-          }
-        };
-
-        const checkWinner = () => {
-          const lines = [];
-          for (let i = 0; i < size; i++) {
-            lines.push(board[i]);
-            lines.push([board[0][i], board[1][i], board[2][i]]);
-          }
-          lines.push([board[0][0], board[1][1], board[2][2]]);
-          lines.push([board[0][2], board[1][1], board[2][0]]);
-          for (const line of lines) {
-            if (line.every((v) => v === "X")) return "X";
-            if (line.every((v) => v === "O")) return "O";
-          }
-          return "";
-        };
-
-        const isDraw = () => board.flat().every((v) => v);
-
-        const render = () => {
-          drawGrid();
-          drawMarks();
-          winnerEl.textContent = winner || "-";
-          turnEl.textContent = current;
-        };
-
-        const reset = () => {
-          for (let y = 0; y < size; y++) {
-            for (let x = 0; x < size; x++) board[y][x] = "";
-          }
-          current = "X";
-          winner = "";
-          render();
-        };
-
-        canvas.addEventListener("click", (event) => {
-          if (winner) return;
-          const rect = canvas.getBoundingClientRect();
-          const x = Math.floor((event.clientX - rect.left) / cell);
-          const y = Math.floor((event.clientY - rect.top) / cell);
-          if (board[y][x]) return;
-          board[y][x] = current;
-          winner = checkWinner();
-          if (!winner && isDraw()) winner = "Draw";
-          if (!winner) current = current === "X" ? "O" : "X";
-          render();
-        });
-
-        resetBtn.addEventListener("click", reset);
-        render();
-      })();
-    </script>
+    <script src="{{ static_url('xo.js') }}" defer></script>
   </body>
 </html>
 """
@@ -368,7 +244,7 @@ HISTORY_TEMPLATE = """
       ({{ refresh_seconds }}s)
       {% endif %}
       |
-      <a href="/history?page={{ page }}&page_size={{ page_size }}&auto_refresh={{ 0 if auto_refresh else 1 }}{% if run_id %}&run_id={{ run_id }}{% endif %}">
+      <a href="/history?page={{ page }}&page_size={{ page_size }}{{ cursor }}&auto_refresh={{ 0 if auto_refresh else 1 }}{% if run_id %}&run_id={{ run_id }}{% endif %}">
         {{ "Pause refresh" if auto_refresh else "Resume refresh" }}
       </a>
       |
@@ -448,10 +324,10 @@ HISTORY_TEMPLATE = """
     <div class="pager">
       <div>Page {{ page }} / {{ total_pages }}</div>
       {% if prev_page %}
-        <a href="/history?page={{ prev_page }}&page_size={{ page_size }}&auto_refresh={{ 1 if auto_refresh else 0 }}{% if run_id %}&run_id={{ run_id }}{% endif %}">Prev</a>
+        <a href="/history?page={{ prev_page }}&page_size={{ page_size }}{% if prev_after_id %}&after_id={{ prev_after_id }}{% endif %}&auto_refresh={{ 1 if auto_refresh else 0 }}{% if run_id %}&run_id={{ run_id }}{% endif %}">Prev</a>
       {% endif %}
       {% if next_page %}
-        <a href="/history?page={{ next_page }}&page_size={{ page_size }}&auto_refresh={{ 1 if auto_refresh else 0 }}{% if run_id %}&run_id={{ run_id }}{% endif %}">Next</a>
+        <a href="/history?page={{ next_page }}&page_size={{ page_size }}&before_id={{ next_before_id }}&auto_refresh={{ 1 if auto_refresh else 0 }}{% if run_id %}&run_id={{ run_id }}{% endif %}">Next</a>
       {% endif %}
     </div>
     <table>
@@ -467,7 +343,7 @@ HISTORY_TEMPLATE = """
       <tbody>
         {% for run in runs %}
           <tr>
-            <td><a href="/history?run_id={{ run.id }}&page={{ page }}&page_size={{ page_size }}&auto_refresh={{ 1 if auto_refresh else 0 }}">{{ run.id }}</a></td>
+            <td><a href="/history?run_id={{ run.id }}&page={{ page }}&page_size={{ page_size }}{{ cursor }}&auto_refresh={{ 1 if auto_refresh else 0 }}">{{ run.id }}</a></td>
             <td>{{ run.fetched_at }}</td>
             <td>{{ run.customer_id }}</td>
             <td>{{ run.days }}</td>
@@ -489,7 +365,7 @@ HISTORY_TEMPLATE = """
         </thead>
         <tbody>
           {% for row in rows %}
-            <tr class="{{ 'total-row' if row.campaign_name == 'TOTAL' else '' }}">
+            <tr class="{{ row.css_class }}">
               <td>{{ row.campaign_id }}</td>
               <td>{{ row.campaign_name }}</td>
               <td>{{ row.status }}</td>
@@ -512,25 +388,188 @@ HISTORY_TEMPLATE = """
 </html>
 """
 
+def _static_url(filename: str) -> str:
+    # The content hash in the query string changes whenever the file does, so
+    # the long-lived immutable cache below never serves a stale copy.
+    version = _static_versions.get(filename)
+    if version is None:
+        with open(os.path.join(app.static_folder, filename), "rb") as handle:
+            version = hashlib.sha256(handle.read()).hexdigest()[:12]
+        _static_versions[filename] = version
+    return url_for("static", filename=filename, v=version)
+
+
+@app.after_request
+def _cache_static_files(response):
+    if request.endpoint == "static":
+        response.headers["Cache-Control"] = (
+            f"public, max-age={_STATIC_MAX_AGE_SECONDS}, immutable"
+        )
+    return response
+
+
+def _gzip_chunks(chunks: Iterable[bytes], source) -> Iterator[bytes]:
+    # Compress a streamed body as it is produced; zlib hands back a block
+    # whenever it has one, so a long table still reaches the browser in
+    # pieces. Closing the source keeps stream_with_context's request
+    # context teardown intact.
+    compressor = zlib.compressobj(wbits=31)
+    try:
+        for chunk in chunks:
+            block = compressor.compress(chunk)
+            if block:
+                yield block
+        yield compressor.flush()
+    finally:
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+
+
+@app.after_request
+def _gzip_html(response):
+    # The history page is re-fetched on every auto-refresh by every open
+    # tab; its markup compresses several times over.
+    if (
+        response.status_code != 200
+        or response.mimetype != "text/html"
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if not request.accept_encodings["gzip"]:
+        return response
+    if response.is_streamed:
+        source = response.response
+        response.response = _gzip_chunks(response.iter_encoded(), source)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < _GZIP_MIN_BYTES:
+            return response
+        compressor = zlib.compressobj(wbits=31)
+        response.set_data(compressor.compress(body) + compressor.flush())
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def _strip_indentation(source: str) -> str:
+    # Leading indentation is only there for whoever edits the template; no
+    # template has <pre>, <textarea> or inline scripts it would matter in.
+    return re.sub(r"\n\s+", "\n", source)
+
+
+app.jinja_env.globals["static_url"] = _static_url
+# Drop the line each {% %} tag sits on, so loops and conditionals stop
+# leaving blank lines in the output; set before the templates compile.
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+
+# Compiled once at import; render_template_string would hash and look up the
+# source on every request.
+_INDEX_TEMPLATE = app.jinja_env.from_string(_strip_indentation(TEMPLATE))
+_HISTORY_TEMPLATE = app.jinja_env.from_string(_strip_indentation(HISTORY_TEMPLATE))
+# Part of the history ETag, so a deploy that changes the page invalidates
+# copies that browsers cached under the old markup.
+_HISTORY_TEMPLATE_VERSION = hashlib.sha256(HISTORY_TEMPLATE.encode()).hexdigest()[:8]
+
+
+def _render(template: Template, **context) -> str:
+    # Same context render_template_string would build (request, g, config
+    # and any context processors), minus the per-call compile.
+    app.update_template_context(context)
+    return template.render(context)
+
+
+def _generate(template: Template, **context) -> Iterator[str]:
+    app.update_template_context(context)
+    return template.generate(context)
+
 
 def _get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    # Read connection for the calling thread, opened on first use, so a page
+    # that runs several queries keeps SQLite's page cache warm instead of
+    # reconnecting. It is confined to its thread and refuses writes; under
+    # WAL any number of readers run alongside the single writer.
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        _ensure_db()
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        # Map the file so reads share the OS page cache instead of each
+        # thread copying pages into its own cache.
+        conn.execute("PRAGMA mmap_size=268435456")
+        _db_local.conn = conn
     return conn
 
 
+@contextmanager
+def _writer() -> Iterator[sqlite3.Connection]:
+    # The one write connection, shared by the scheduler and Run Once jobs;
+    # the lock serializes them and each block is a single transaction.
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is None:
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            _writer_conn = conn
+        with _writer_conn:
+            yield _writer_conn
+
+
+def _ensure_db() -> None:
+    # Create/migrate the schema once per process before the first query, so
+    # a Run Once or page view never meets a database from an older layout.
+    global _db_initialized
+    if _db_initialized:
+        return
+    with _db_init_lock:
+        if not _db_initialized:
+            _init_db()
+            _db_initialized = True
+
+
 def _init_db() -> None:
-    with _get_conn() as conn:
+    with _writer() as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS runs (
               id INTEGER PRIMARY KEY AUTOINCREMENT,
               fetched_at TEXT NOT NULL,
               customer_id TEXT NOT NULL,
-              days INTEGER NOT NULL
+              days INTEGER NOT NULL,
+              fetched_at_epoch INTEGER,
+              campaign_count INTEGER
             )
             """
         )
+        run_columns = {row["name"] for row in conn.execute("PRAGMA table_info(runs)")}
+        if "fetched_at_epoch" not in run_columns:
+            conn.execute("ALTER TABLE runs ADD COLUMN fetched_at_epoch INTEGER")
+            conn.execute(
+                """
+                UPDATE runs
+                SET fetched_at_epoch = CAST(strftime('%s', fetched_at) AS INTEGER)
+                """
+            )
+        if "campaign_count" not in run_columns:
+            conn.execute("ALTER TABLE runs ADD COLUMN campaign_count INTEGER")
+            conn.execute(
+                """
+                UPDATE runs
+                SET campaign_count = (
+                  SELECT COUNT(*)
+                  FROM campaigns
+                  WHERE campaigns.run_id = runs.id
+                    AND campaigns.campaign_name != 'TOTAL'
+                )
+                """
+            )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS campaigns (
@@ -556,50 +595,71 @@ def _init_db() -> None:
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_runs_fetched_at ON runs(fetched_at)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_runs_epoch ON runs(fetched_at_epoch)"
+        )
+        # Entries are ordered (run_id, rowid), so _fetch_run_rows' ORDER BY id
+        # comes straight off this index; adding campaign_name to it would
+        # force a sort there, and the non-TOTAL counts use the partial index.
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_campaigns_run_id ON campaigns(run_id)"
         )
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_campaigns_name ON campaigns(campaign_name)"
         )
+        # Every stats/page query skips the synthetic TOTAL row, so index the
+        # remaining rows by run on their own.
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_campaigns_nontotal_run
+            ON campaigns(run_id) WHERE campaign_name != 'TOTAL'
+            """
+        )
+
+
+def _refresh_planner_stats(conn: sqlite3.Connection, run_id: int) -> None:
+    # The scheduler appends a run a minute; keep sqlite_stat1 in step so the
+    # planner's picks for the history queries do not drift as tables grow.
+    # PRAGMA optimize is a no-op when nothing changed enough to matter.
+    if run_id % _ANALYZE_EVERY_RUNS == 0:
+        conn.execute("ANALYZE")
+    elif run_id % _OPTIMIZE_EVERY_RUNS == 0:
+        conn.execute("PRAGMA optimize")
 
 
 def _persist_run(customer_id: str, days: int, rows: List[ads.CampaignRow]) -> int:
-    fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with _get_conn() as conn:
+    now = datetime.now()
+    fetched_at = now.strftime("%Y-%m-%d %H:%M:%S")
+    # Pull the column values out before taking the write lock so the
+    # transaction only spends its time in SQLite.
+    values = list(map(ads._ROW_GETTER, rows))
+    campaign_count = sum(1 for row in rows if row.campaign_name != "TOTAL")
+    _ensure_db()
+    with _writer() as conn:
         cur = conn.execute(
-            "INSERT INTO runs (fetched_at, customer_id, days) VALUES (?, ?, ?)",
-            (fetched_at, customer_id, days),
+            """
+            INSERT INTO runs (
+              fetched_at, customer_id, days, fetched_at_epoch, campaign_count
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (fetched_at, customer_id, days, _wall_clock_epoch(now), campaign_count),
         )
         run_id = cur.lastrowid
-        for row in rows:
-            conn.execute(
-                """
-                INSERT INTO campaigns (
-                  run_id, campaign_id, campaign_name, status,
-                  impressions, clicks, ctr_percent, search_impression_share,
-                  average_cpc, cost_per_click, cost, conversions,
-                  conversion_value, cost_per_conversion
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    run_id,
-                    row.campaign_id,
-                    row.campaign_name,
-                    row.status,
-                    row.impressions,
-                    row.clicks,
-                    row.ctr_percent,
-                    row.search_impression_share,
-                    row.average_cpc,
-                    row.cost_per_click,
-                    row.cost,
-                    row.conversions,
-                    row.conversion_value,
-                    row.cost_per_conversion,
-                ),
+        # CampaignRow's field order matches the column list after run_id.
+        conn.executemany(
+            """
+            INSERT INTO campaigns (
+              run_id, campaign_id, campaign_name, status,
+              impressions, clicks, ctr_percent, search_impression_share,
+              average_cpc, cost_per_click, cost, conversions,
+              conversion_value, cost_per_conversion
             )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(run_id, *value) for value in values],
+        )
+        _refresh_planner_stats(conn, run_id)
     print(
         f"[scheduler] run_id={run_id} fetched_at={fetched_at} "
         f"customer_id={customer_id} days={days} rows={len(rows)}"
@@ -607,141 +667,184 @@ def _persist_run(customer_id: str, days: int, rows: List[ads.CampaignRow]) -> in
     return int(run_id)
 
 
-def _count_runs() -> int:
-    with _get_conn() as conn:
-        row = conn.execute("SELECT COUNT(*) AS cnt FROM runs").fetchone()
-        return int(row["cnt"]) if row else 0
-
-
-def _fetch_runs_page(page: int, page_size: int) -> List[sqlite3.Row]:
-    offset = (page - 1) * page_size
+def _fetch_runs_page(
+    page: int,
+    page_size: int,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> List[sqlite3.Row]:
+    # Prev/Next links carry the id at the page edge, so those pages are an
+    # index seek on the primary key however deep they are; OFFSET is only
+    # the fallback for a bare ?page= link. campaign_count is stored with
+    # the run, so the page never touches the campaigns table.
     with _get_conn() as conn:
+        if before_id is not None:
+            return conn.execute(
+                """
+                SELECT id, fetched_at, customer_id, days, campaign_count
+                FROM runs
+                WHERE id < ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (before_id, page_size),
+            ).fetchall()
+        if after_id is not None:
+            return conn.execute(
+                """
+                SELECT id, fetched_at, customer_id, days, campaign_count
+                FROM (
+                  SELECT id, fetched_at, customer_id, days, campaign_count
+                  FROM runs
+                  WHERE id > ?
+                  ORDER BY id ASC
+                  LIMIT ?
+                )
+                ORDER BY id DESC
+                """,
+                (after_id, page_size),
+            ).fetchall()
         return conn.execute(
             """
-            SELECT runs.id, runs.fetched_at, runs.customer_id, runs.days,
-                   SUM(CASE WHEN campaigns.campaign_name = 'TOTAL' THEN 0 ELSE 1 END)
-                     AS campaign_count
+            SELECT id, fetched_at, customer_id, days, campaign_count
             FROM runs
-            LEFT JOIN campaigns ON campaigns.run_id = runs.id
-            GROUP BY runs.id
-            ORDER BY runs.id DESC
+            ORDER BY id DESC
             LIMIT ? OFFSET ?
             """,
-            (page_size, offset),
+            (page_size, (page - 1) * page_size),
         ).fetchall()
 
 
+def _has_older_run(run_id: int) -> bool:
+    # Next is shown only when a run older than the page's last one exists;
+    # counting pages instead goes wrong once new runs shift the total.
+    with _get_conn() as conn:
+        return bool(
+            conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM runs WHERE id < ?)", (run_id,)
+            ).fetchone()[0]
+        )
+
+
+def _optional_int(raw: Optional[str]) -> Optional[int]:
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
 def _fetch_history_stats() -> dict:
+    # One statement for the whole stats panel; the scalar subqueries always
+    # yield exactly one row.
     with _get_conn() as conn:
         stats = conn.execute(
             """
-            SELECT COUNT(*) AS total_runs,
-                   MAX(fetched_at) AS last_run
-            FROM runs
-            """
-        ).fetchone()
-        total_campaigns = conn.execute(
-            """
-            SELECT COUNT(*) AS total_campaigns
-            FROM campaigns
-            WHERE campaign_name != 'TOTAL'
-            """
-        ).fetchone()
-        latest_run = conn.execute(
-            """
-            SELECT id, customer_id
-            FROM runs
-            ORDER BY id DESC
-            LIMIT 1
+            WITH latest AS (
+              SELECT id, customer_id
+              FROM runs
+              ORDER BY id DESC
+              LIMIT 1
+            )
+            SELECT (SELECT COUNT(*) FROM runs) AS total_runs,
+                   (SELECT MAX(fetched_at) FROM runs) AS last_run,
+                   (SELECT COUNT(*)
+                    FROM campaigns
+                    WHERE campaign_name != 'TOTAL') AS total_campaigns,
+                   (SELECT id FROM latest) AS latest_run_id,
+                   (SELECT customer_id FROM latest) AS latest_customer_id,
+                   (SELECT COUNT(*)
+                    FROM campaigns
+                    WHERE run_id = (SELECT id FROM latest)
+                      AND campaign_name != 'TOTAL') AS latest_campaigns
             """
         ).fetchone()
-        latest_campaigns = None
-        if latest_run:
-            latest_campaigns = conn.execute(
-                """
-                SELECT COUNT(*) AS cnt
-                FROM campaigns
-                WHERE run_id = ? AND campaign_name != 'TOTAL'
-                """,
-                (latest_run["id"],),
-            ).fetchone()
+    return dict(stats)
 
-    return {
-        "total_runs": stats["total_runs"] if stats else 0,
-        "last_run": stats["last_run"] if stats else None,
-        "total_campaigns": total_campaigns["total_campaigns"] if total_campaigns else 0,
-        "latest_run_id": latest_run["id"] if latest_run else None,
-        "latest_customer_id": latest_run["customer_id"] if latest_run else None,
-        "latest_campaigns": latest_campaigns["cnt"] if latest_campaigns else 0,
-    }
 
+def _history_etag() -> str:
+    # The page only changes when a run is added, when the 5-minute chart
+    # window moves on, when the refresh interval is reconfigured, or when the
+    # template itself changes. Query parameters need no part in it: browsers
+    # key cached copies by the full URL.
+    with _get_conn() as conn:
+        latest_id, total = conn.execute(
+            "SELECT MAX(id), COUNT(*) FROM runs"
+        ).fetchone()
+    window = _wall_clock_epoch(datetime.now()) // 300
+    return (
+        f"{latest_id or 0}-{total}-{window}-{SCHEDULER_INTERVAL_SECONDS}"
+        f"-{_HISTORY_TEMPLATE_VERSION}"
+    )
 
-def _fetch_run_rows(run_id: int) -> List[sqlite3.Row]:
+
+def _fetch_run_rows(run_id: int) -> Iterator[sqlite3.Row]:
+    # Yields straight off the cursor so the history table can be streamed
+    # out while SQLite is still stepping through the run's rows.
     with _get_conn() as conn:
-        return conn.execute(
+        yield from conn.execute(
             """
             SELECT campaign_id, campaign_name, status, impressions, clicks,
                    ctr_percent, search_impression_share, average_cpc,
                    cost_per_click, cost, conversions, conversion_value,
-                   cost_per_conversion
+                   cost_per_conversion,
+                   CASE WHEN campaign_name = 'TOTAL' THEN 'total-row' ELSE '' END
+                     AS css_class
             FROM campaigns
             WHERE run_id = ?
             ORDER BY id ASC
             """,
             (run_id,),
-        ).fetchall()
+        )
 
 
-def _fetch_runs_per_day(limit_days: int = 30) -> List[sqlite3.Row]:
-    with _get_conn() as conn:
-        return conn.execute(
-            """
-            SELECT substr(fetched_at, 1, 10) AS day, COUNT(*) AS runs
-            FROM runs
-            GROUP BY day
-            ORDER BY day DESC
-            LIMIT ?
-            """,
-            (limit_days,),
-        ).fetchall()
+def _wall_clock_epoch(moment: datetime) -> int:
+    # fetched_at is local wall-clock time; count its seconds as if it were UTC
+    # (what SQLite's strftime('%s', ...) does) so integer buckets fall on the
+    # same local day/hour boundaries as the fetched_at text.
+    return calendar.timegm(moment.timetuple())
 
 
-def _fetch_runs_per_hour(limit_hours: int = 24) -> List[sqlite3.Row]:
+def _fetch_run_series() -> Dict[str, List[Tuple[str, int]]]:
+    # One range scan counts runs per 5-minute slot over the widest window
+    # (30 days); hours and days are sums of those slots, since both are
+    # whole multiples of 300 seconds. Each series keeps its newest `limit`
+    # buckets up to now as (label, runs) pairs, oldest first as the charts
+    # plot them.
+    now_epoch = _wall_clock_epoch(datetime.now())
+    windows = [
+        (key, seconds, label_format, (now_epoch // seconds - (limit - 1)) * seconds)
+        for key, seconds, label_format, limit in _RUN_CHART_WINDOWS
+    ]
     with _get_conn() as conn:
-        return conn.execute(
+        slots = conn.execute(
             """
-            SELECT substr(fetched_at, 1, 13) AS hour, COUNT(*) AS runs
+            SELECT fetched_at_epoch / 300 * 300 AS slot, COUNT(*) AS runs
             FROM runs
-            GROUP BY hour
-            ORDER BY hour DESC
-            LIMIT ?
+            WHERE fetched_at_epoch >= ?
+            GROUP BY slot
             """,
-            (limit_hours,),
+            (min(window[3] for window in windows),),
         ).fetchall()
 
-
-def _fetch_runs_per_5min(limit_buckets: int = 72) -> List[sqlite3.Row]:
-    with _get_conn() as conn:
-        return conn.execute(
-            """
-            SELECT
-              substr(fetched_at, 1, 14) ||
-              printf('%02d', (CAST(substr(fetched_at, 15, 2) AS INTEGER) / 5) * 5)
-              AS bucket,
-              COUNT(*) AS runs
-            FROM runs
-            GROUP BY bucket
-            ORDER BY bucket DESC
-            LIMIT ?
-            """,
-            (limit_buckets,),
-        ).fetchall()
+    series: Dict[str, List[Tuple[str, int]]] = {}
+    for key, seconds, label_format, since in windows:
+        counts: Dict[int, int] = {}
+        for slot, runs in slots:
+            if slot >= since:
+                bucket = slot // seconds * seconds
+                counts[bucket] = counts.get(bucket, 0) + runs
+        series[key] = [
+            (
+                datetime.fromtimestamp(bucket, timezone.utc).strftime(label_format),
+                runs,
+            )
+            for bucket, runs in sorted(counts.items())
+        ]
+    return series
 
 
 def _build_line_series(
-    rows: List[sqlite3.Row],
-    label_key: str,
-    count_key: str = "runs",
+    rows: List[Tuple[str, int]],
     width: int = 900,
     height: int = 140,
     padding: int = 10,
@@ -757,37 +860,57 @@ def _build_line_series(
             "max_value": 0,
         }
 
-    max_count = max(row[count_key] for row in rows) or 1
-    count = len(rows)
-    span_x = max(width - padding * 2, 1)
-    span_y = max(height - padding * 2, 1)
-
-    dots = []
-    for idx, row in enumerate(rows):
-        x = padding + (span_x * idx / (count - 1 if count > 1 else 1))
-        y = padding + (span_y * (1 - (row[count_key] / max_count)))
-        dots.append(
-            {
-                "x": round(x, 2),
-                "y": round(y, 2),
-                "label": row[label_key],
-                "count": row[count_key],
-            }
-        )
+    labels, counts = zip(*rows)
+    max_count = max(counts) or 1
+    step_x = max(width - padding * 2, 1) / max(len(rows) - 1, 1)
+    scale_y = max(height - padding * 2, 1) / max_count
+    bottom = padding + max(height - padding * 2, 1)
+
+    # Coordinates are formatted to two decimals once; the polyline and the
+    # dots share the same strings.
+    xs = [f"{padding + step_x * idx:.2f}" for idx in range(len(counts))]
+    ys = [f"{bottom - scale_y * value:.2f}" for value in counts]
+    points = " ".join(map(",".join, zip(xs, ys)))
+    dots = [
+        {"x": x, "y": y, "label": label, "count": value}
+        for x, y, label, value in zip(xs, ys, labels, counts)
+    ]
 
-    points = " ".join(f"{dot['x']},{dot['y']}" for dot in dots)
     return {
         "points": points,
         "dots": dots,
         "width": width,
         "height": height,
-        "start_label": rows[0][label_key],
-        "end_label": rows[-1][label_key],
+        "start_label": labels[0],
+        "end_label": labels[-1],
         "max_value": max_count,
     }
 
 
+def _history_chart_series(etag: str) -> Dict[str, dict]:
+    # The charts only change when the history ETag does (a new run or the
+    # next 5-minute slot), so the built series are reused until it moves on.
+    # Keying on the ETag rather than a write counter also picks up runs
+    # persisted by another worker process.
+    global _chart_series_etag, _chart_series
+    with _chart_series_lock:
+        if _chart_series_etag == etag:
+            return _chart_series
+    run_series = _fetch_run_series()
+    charts = {
+        "daily_series": _build_line_series(run_series["day"]),
+        "hourly_series": _build_line_series(run_series["hour"]),
+        "five_min_series": _build_line_series(run_series["bucket"]),
+    }
+    with _chart_series_lock:
+        _chart_series_etag = etag
+        _chart_series = charts
+    return charts
+
+
 def _build_client() -> ads.GoogleAdsClient:
+    # Reads credentials from the environment _load_config() already filled
+    # from .env; nothing here touches the file.
     args = SimpleNamespace(
         google_ads_yaml=None,
         env_file=None,
@@ -800,11 +923,11 @@ def _build_client() -> ads.GoogleAdsClient:
     return ads._build_client(args)
 
 
-def _load_env_if_present() -> None:
+def _load_env_if_present(reload: bool = False) -> None:
     args = SimpleNamespace(env_file=None)
     env_file = ads._resolve_env_file(args)
     if env_file:
-        ads._load_env_file(env_file)
+        ads._load_env_file(env_file, reload=reload)
 
 
 def _load_scheduler_config() -> None:
@@ -816,6 +939,22 @@ def _load_scheduler_config() -> None:
     SCHEDULER_ENABLED = os.getenv("GOOGLE_ADS_SCHEDULER_ENABLED", "1") == "1"
 
 
+def _load_config(force: bool = False) -> None:
+    # Nothing changes .env behind a running process except an edit, so the
+    # file is read once; /reload-env forces a re-read that also picks up
+    # changed values for the variables the file set.
+    global _config_loaded
+    if _config_loaded and not force:
+        return
+    _load_env_if_present(reload=force)
+    _load_scheduler_config()
+    _config_loaded = True
+
+
+def _live_cache_seconds() -> float:
+    return float(os.getenv("GOOGLE_ADS_LIVE_CACHE_SECONDS", "60"))
+
+
 def _get_default_customer_id() -> str | None:
     return os.getenv("GOOGLE_ADS_DEFAULT_CUSTOMER_ID")
 
@@ -826,11 +965,13 @@ def _scheduler_is_enabled() -> bool:
 
 def _stop_scheduler() -> None:
     global _scheduler_started, _scheduler_stop_event, _scheduler_backoff_until
+    global _scheduler_failures
     if not _scheduler_started:
         return
     _scheduler_stop_event.set()
     _scheduler_started = False
     _scheduler_backoff_until = None
+    _scheduler_failures = 0
     _scheduler_stop_event = threading.Event()
 
 
@@ -841,7 +982,52 @@ def _run_once(customer_id: str, days: int) -> None:
     _persist_run(customer_id, days, rows)
 
 
+def _failure_delay(failures: int) -> float:
+    # Grow the wait geometrically from the poll interval, with jitter so
+    # several workers hitting the same outage do not retry in lockstep.
+    delay = min(
+        _SCHEDULER_BACKOFF_CAP_SECONDS,
+        SCHEDULER_INTERVAL_SECONDS * _SCHEDULER_BACKOFF_MULTIPLIER**failures,
+    )
+    return delay * random.uniform(0.5, 1.5)
+
+
+def _finish_run_once(customer_id: str, job: Future) -> None:
+    with _run_once_lock:
+        if _run_once_jobs.get(customer_id) is job:
+            del _run_once_jobs[customer_id]
+    ex = job.exception()
+    if ex is not None:
+        print(f"[run_once] customer_id={customer_id} error={ex}")
+
+
+def _queue_run_once(customer_id: str, days: int) -> bool:
+    # Runs on the shared pool so the request returns right away; a customer
+    # with a run still in flight is not queued twice.
+    with _run_once_lock:
+        job = _run_once_jobs.get(customer_id)
+        if job is not None and not job.done():
+            return False
+        job = _run_once_executor.submit(_run_once, customer_id, days)
+        _run_once_jobs[customer_id] = job
+    job.add_done_callback(lambda done: _finish_run_once(customer_id, done))
+    return True
+
+
+def _next_tick(previous: float, now: float) -> float:
+    # Ticks stay on the cadence set by the previous one, so the time a fetch
+    # takes does not push every later run back; ticks missed while a run
+    # overran are skipped rather than run back to back.
+    interval = max(SCHEDULER_INTERVAL_SECONDS, 1)
+    next_tick = previous + interval
+    if next_tick <= now:
+        next_tick += ((now - next_tick) // interval + 1) * interval
+    return next_tick
+
+
 def _scheduler_loop() -> None:
+    global _scheduler_failures
+    next_tick = time.monotonic()
     while not _scheduler_stop_event.is_set():
         try:
             if not _scheduler_is_enabled():
@@ -853,19 +1039,24 @@ def _scheduler_loop() -> None:
             customer_id = _get_default_customer_id()
             if customer_id:
                 _run_once(customer_id, SCHEDULER_DAYS)
+            _scheduler_failures = 0
         except Exception as ex:
+            _scheduler_failures += 1
             _apply_backoff(ex)
-            print(f"[scheduler] error={ex}")
-        _scheduler_stop_event.wait(SCHEDULER_INTERVAL_SECONDS)
+            print(f"[scheduler] error={ex} failures={_scheduler_failures}")
+        if _scheduler_failures:
+            next_tick = time.monotonic() + _failure_delay(_scheduler_failures)
+        else:
+            next_tick = _next_tick(next_tick, time.monotonic())
+        _scheduler_stop_event.wait(max(next_tick - time.monotonic(), 0))
 
 
 def _start_scheduler() -> None:
     global _scheduler_started
-    _load_env_if_present()
-    _load_scheduler_config()
+    _load_config()
     if _scheduler_started or not _scheduler_is_enabled():
         return
-    _init_db()
+    _ensure_db()
     thread = threading.Thread(target=_scheduler_loop, daemon=True)
     thread.start()
     _scheduler_started = True
@@ -874,9 +1065,9 @@ def _start_scheduler() -> None:
 def _apply_backoff(ex: Exception) -> None:
     global _scheduler_backoff_until
     message = str(ex)
-    if "Resource has been exhausted" not in message and "429" not in message:
+    if not any(token in message for token in _BACKOFF_TOKENS):
         return
-    match = re.search(r"Retry in (\\d+) seconds", message)
+    match = _RETRY_RE.search(message)
     seconds = int(match.group(1)) if match else 3600
     _scheduler_backoff_until = datetime.now() + timedelta(seconds=seconds)
     print(
@@ -888,8 +1079,6 @@ def _apply_backoff(ex: Exception) -> None:
 @app.route("/", methods=["GET"])
 def index():
     _start_scheduler()
-    _load_env_if_present()
-    _load_scheduler_config()
     customer_id = request.args.get("customer_id") or _get_default_customer_id()
     days = int(request.args.get("days", SCHEDULER_DAYS))
     fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -902,8 +1091,8 @@ def index():
     )
 
     if not customer_id:
-        return render_template_string(
-            TEMPLATE,
+        return _render(
+            _INDEX_TEMPLATE,
             customer_id=customer_id,
             days=days,
             fetched_at=fetched_at,
@@ -917,29 +1106,16 @@ def index():
 
     try:
         client = _build_client()
-        rows: List[ads.CampaignRow] = ads._fetch_campaigns(client, customer_id, days)
+        rows: List[ads.CampaignRow] = ads._fetch_campaigns_cached(
+            client, customer_id, days, _live_cache_seconds()
+        )
         rows = ads._rows_with_total(rows)
-        headers = [
-            "campaign_id",
-            "campaign_name",
-            "status",
-            "impressions",
-            "clicks",
-            "ctr_percent",
-            "search_impression_share",
-            "average_cpc",
-            "cost_per_click",
-            "cost",
-            "conversions",
-            "conversion_value",
-            "cost_per_conversion",
-        ]
-        return render_template_string(
-            TEMPLATE,
+        return _render(
+            _INDEX_TEMPLATE,
             customer_id=customer_id,
             days=days,
             fetched_at=fetched_at,
-            headers=headers,
+            headers=ads._HEADERS,
             rows=rows,
             error=None,
             message=message,
@@ -947,8 +1123,8 @@ def index():
             backoff_until=backoff_until,
         )
     except Exception as ex:
-        return render_template_string(
-            TEMPLATE,
+        return _render(
+            _INDEX_TEMPLATE,
             customer_id=customer_id,
             days=days,
             fetched_at=fetched_at,
@@ -964,8 +1140,7 @@ def index():
 @app.route("/control", methods=["POST"])
 def control():
     global _scheduler_forced_enabled
-    _load_env_if_present()
-    _load_scheduler_config()
+    _load_config()
     action = request.form.get("action")
     customer_id = request.form.get("customer_id") or _get_default_customer_id()
     message = None
@@ -982,18 +1157,33 @@ def control():
         if not customer_id:
             message = "Missing customer_id"
         else:
-            _run_once(customer_id, SCHEDULER_DAYS)
-            message = "Run complete"
+            if _queue_run_once(customer_id, SCHEDULER_DAYS):
+                message = "Run queued"
+            else:
+                message = "Run already in progress"
     else:
         message = "Unknown action"
 
     return redirect(url_for("index", customer_id=customer_id, message=message))
 
 
+@app.route("/reload-env", methods=["POST"])
+def reload_env():
+    _load_config(force=True)
+    return redirect(url_for("index", message="Config reloaded"))
+
+
 @app.route("/history", methods=["GET"])
 def history():
     _start_scheduler()
-    _init_db()
+    etag = _history_etag()
+    # Weak, since the gzip and plain bodies are the same page.
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = _HISTORY_CACHE_CONTROL
+        return response
+
     auto_refresh_raw = request.args.get("auto_refresh", "1")
     auto_refresh = auto_refresh_raw != "0"
     page_raw = request.args.get("page", "1")
@@ -1008,65 +1198,88 @@ def history():
         page_size = 100
     page_size = min(max(page_size, 20), 500)
 
-    total_runs = _count_runs()
-    total_pages = max((total_runs + page_size - 1) // page_size, 1)
+    # Neither aggregate depends on the request, so start both before the
+    # page queries and wait only when their results are needed.
+    stats_job = _history_read_executor.submit(_fetch_history_stats)
+    charts_job = _history_read_executor.submit(_history_chart_series, etag)
+
+    # The stats query already counts the runs; size the pager from it.
+    stats = stats_job.result()
+    total_pages = max((stats["total_runs"] + page_size - 1) // page_size, 1)
     if page > total_pages:
         page = total_pages
 
-    runs = _fetch_runs_page(page, page_size)
-    stats = _fetch_history_stats()
-    daily_raw = _fetch_runs_per_day()
-    hourly_raw = _fetch_runs_per_hour()
-    five_min_raw = _fetch_runs_per_5min()
+    before_id = _optional_int(request.args.get("before_id"))
+    after_id = _optional_int(request.args.get("after_id"))
+    runs = _fetch_runs_page(page, page_size, before_id, after_id)
+    if not runs and (before_id is not None or after_id is not None):
+        # A cursor past either end of the history (a stale link, or a
+        # hand-edited id) has nothing to show; start over from the newest.
+        return redirect(
+            url_for(
+                "history",
+                page_size=page_size,
+                auto_refresh=1 if auto_refresh else 0,
+                run_id=request.args.get("run_id") or None,
+            )
+        )
+    prev_page = (page - 1) if page > 1 else None
+    next_page = (page + 1) if runs and _has_older_run(runs[-1]["id"]) else None
+    if before_id is not None:
+        cursor = f"&before_id={before_id}"
+    elif after_id is not None:
+        cursor = f"&after_id={after_id}"
+    else:
+        cursor = ""
     run_id_raw = request.args.get("run_id")
-    rows: List[sqlite3.Row] = []
+    rows: Iterable[sqlite3.Row] = ()
     run_id: Optional[int] = None
     if run_id_raw:
         try:
             run_id = int(run_id_raw)
-            rows = _fetch_run_rows(run_id)
         except ValueError:
             run_id = None
-
-    headers = [
-        "campaign_id",
-        "campaign_name",
-        "status",
-        "impressions",
-        "clicks",
-        "ctr_percent",
-        "search_impression_share",
-        "average_cpc",
-        "cost_per_click",
-        "cost",
-        "conversions",
-        "conversion_value",
-        "cost_per_conversion",
-    ]
-    daily_raw = list(reversed(daily_raw))
-    hourly_raw = list(reversed(hourly_raw))
-    five_min_raw = list(reversed(five_min_raw))
-    daily_series = _build_line_series(daily_raw, "day")
-    hourly_series = _build_line_series(hourly_raw, "hour")
-    five_min_series = _build_line_series(five_min_raw, "bucket")
-    return render_template_string(
-        HISTORY_TEMPLATE,
-        runs=runs,
-        run_id=run_id,
-        rows=rows,
-        headers=headers,
-        stats=stats,
-        refresh_seconds=SCHEDULER_INTERVAL_SECONDS,
-        auto_refresh=auto_refresh,
-        daily_series=daily_series,
-        hourly_series=hourly_series,
-        five_min_series=five_min_series,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        prev_page=(page - 1) if page > 1 else None,
-        next_page=(page + 1) if page < total_pages else None,
+        else:
+            # Stays on this thread: the rows stream from this thread's
+            # reader while the page renders. Peek one row so the template's
+            # `if rows` still hides the table for a run with no campaigns.
+            run_rows = _fetch_run_rows(run_id)
+            first_row = next(run_rows, None)
+            if first_row is not None:
+                rows = chain((first_row,), run_rows)
+
+    charts = charts_job.result()
+    response = app.response_class(
+        stream_with_context(
+            _generate(
+                _HISTORY_TEMPLATE,
+                runs=runs,
+                run_id=run_id,
+                rows=rows,
+                headers=ads._HEADERS,
+                stats=stats,
+                refresh_seconds=SCHEDULER_INTERVAL_SECONDS,
+                auto_refresh=auto_refresh,
+                **charts,
+                page=page,
+                page_size=page_size,
+                total_pages=total_pages,
+                prev_page=prev_page,
+                next_page=next_page,
+                # Page 1 is always "the newest runs", so its link has no
+                # cursor and keeps showing new runs as they arrive.
+                prev_after_id=(
+                    runs[0]["id"] if runs and prev_page and prev_page > 1 else None
+                ),
+                next_before_id=runs[-1]["id"] if next_page else None,
+                cursor=cursor,
+            )
+        ),
+        mimetype="text/html",
     )
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = _HISTORY_CACHE_CONTROL
+    return response
 
 
 if __name__ == "__main__":